@@ -3,34 +3,280 @@
 提供基于订阅的多资源版本管理和过滤功能
 """
 
+import copy
 import json
-from typing import Dict, List, Any, Tuple, Optional, Union, Set
+import sys
+import threading
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from multiprocessing.dummy import Pool as ThreadPool
+from typing import Dict, List, Any, Tuple, Optional, Union, Set, Callable, FrozenSet
 from datetime import datetime
 
+from cachetools import TTLCache
+from fastapi import HTTPException
+
 from app import schemas
 from app.actions import ActionChain
 from app.chain.subscribe import SubscribeChain
 from app.core.config import settings
 from app.core.context import Context, MediaInfo, MetaInfo, TorrentInfo
+from app.core.event import eventmanager, Event
 from app.core.meta import MetaBase
 from app.db.systemconfig_oper import SystemConfigOper
 from app.plugins import _PluginBase
 from app.schemas.workflow import ActionContext
 from app.helper.torrent import TorrentHelper
-from app.helper.subscribe import SubscribeHelper
-from app.helper.sites import SitesHelper
 from app.modules.filter import FilterModule
 from app.chain.search import SearchChain
 from app.chain.download import DownloadChain
 from app.chain.media import MediaChain
-from app.helper.downloader import DownloaderHelper
 from app.db.subscribe_oper import SubscribeOper
 from app.db.models.subscribe import Subscribe
 from app.db.downloadhistory_oper import DownloadHistoryOper
 from app.db.models.downloadhistory import DownloadHistory
-from app.schemas.types import MediaType, SystemConfigKey
+from app.schemas.types import EventType, MediaType, SystemConfigKey
 from app.log import logger
 
+# 已下载种子在 meta_info.org_string 中的标记前缀
+_DOWNLOADED_PREFIX = sys.intern("downloaded:")
+
+
+# 插件配置页面
+_FORM_CONTENT = [
+    {
+        'component': 'VForm',
+        'content': [
+            {
+                'component': 'VRow',
+                'content': [
+                    {
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                            'md': 4
+                        },
+                        'content': [
+                            {
+                                'component': 'VSwitch',
+                                'props': {
+                                    'model': 'enabled',
+                                    'label': '启用插件',
+                                }
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                            'md': 4
+                        },
+                        'content': [
+                            {
+                                'component': 'VSwitch',
+                                'props': {
+                                    'model': 'enable_search',
+                                    'label': '启用查询功能',
+                                }
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                            'md': 4
+                        },
+                        'content': [
+                            {
+                                'component': 'VSwitch',
+                                'props': {
+                                    'model': 'enable_filter',
+                                    'label': '启用过滤功能',
+                                }
+                            }
+                        ]
+                    }
+                ]
+            },
+            {
+                'component': 'VRow',
+                'content': [
+                    {
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                            'md': 4
+                        },
+                        'content': [
+                            {
+                                'component': 'VTextField',
+                                'props': {
+                                    'model': 'search_thread_count',
+                                    'label': '并发搜索线程数',
+                                    'placeholder': '2',
+                                    'hint': '同时处理的订阅数，每个订阅都会搜索全部站点',
+                                    'persistent-hint': True
+                                }
+                            }
+                        ]
+                    }
+                ]
+            },
+            {
+                'component': 'VRow',
+                'content': [
+                    {
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12
+                        },
+                        'content': [
+                            {
+                                'component': 'VTextarea',
+                                'props': {
+                                    'model': 'default_filter_rules',
+                                    'label': '默认过滤规则',
+                                    'placeholder': '默认的过滤规则，JSON格式或键值对格式',
+                                    'rows': 4,
+                                    'hint': '默认的过滤规则，JSON格式或键值对格式',
+                                    'persistent-hint': True
+                                }
+                            }
+                        ]
+                    }
+                ]
+            },
+            {
+                'component': 'VRow',
+                'content': [
+                    {
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12
+                        },
+                        'content': [
+                            {
+                                'component': 'VAlert',
+                                'props': {
+                                    'type': 'info',
+                                    'variant': 'tonal',
+                                    'text': '订阅多资源版本订阅插件提供基于订阅的多资源版本管理和过滤功能。'
+                                            '启用查询功能后，插件会根据订阅信息查询种子资源。'
+                                            '启用过滤功能后，插件会根据设定的规则过滤种子资源。'
+                                            '过滤规则支持JSON格式或键值对格式。'
+                                }
+                            }
+                        ]
+                    }
+                ]
+            }
+        ]
+    }
+]
+
+# 插件配置默认数据
+_FORM_MODEL = {
+    "enabled": False,
+    "enable_search": True,
+    "enable_filter": True,
+    "search_thread_count": 2,
+    "default_filter_rules": ""
+}
+
+
+@lru_cache(maxsize=None)
+def _media_type(value: str) -> MediaType:
+    """
+    订阅类型字符串转换为媒体类型，无效类型抛出ValueError
+    """
+    return MediaType(value)
+
+
+@lru_cache(maxsize=512)
+def _match_needles_for_subscribe(name: str, year: str, type_: str,
+                                 season: int, episode: int) -> Tuple[str, ...]:
+    """
+    预编译订阅的匹配关键字（均为小写），按订阅字段缓存
+    季集关键字在此一次性格式化，种子标题需包含全部关键字才算匹配
+    """
+    # 空名称必然包含于任何标题，无需作为关键字
+    needles = [name.lower()] if name else []
+
+    # 年份
+    if year:
+        needles.append(str(year))
+
+    # 季集信息
+    needles.extend(_season_needles_for_subscribe(type_, season, episode))
+
+    return tuple(needles)
+
+
+@lru_cache(maxsize=512)
+def _season_needles_for_subscribe(type_: str, season: int, episode: int) -> Tuple[str, ...]:
+    """
+    预编译订阅的季集匹配关键字（均为小写），电影没有季集关键字
+    """
+    needles = []
+    if _media_type(type_) == MediaType.TV:
+        if season:
+            needles.append(f"s{season:02d}")
+        if episode:
+            needles.append(f"e{episode:02d}")
+
+    return tuple(needles)
+
+
+@lru_cache(maxsize=64)
+def _parse_filter_rules_cached(rules_str: str) -> Dict[str, Any]:
+    """
+    解析过滤规则字符串，支持JSON格式或键值对格式，按规则内容缓存
+    """
+    try:
+        return json.loads(rules_str)
+    except json.JSONDecodeError:
+        # 如果不是JSON，尝试解析键值对
+        return {key.strip(): value.strip() for key, value in
+                (rule.split("=", 1) for rule in rules_str.split(",") if "=" in rule)}
+
+
+def _parse_range(value: Optional[str], prefix: str) -> Optional[Tuple[int, Optional[int]]]:
+    """
+    解析下载历史中记录的季集范围，如 S01、S01-S02、E01-E05
+    :return: (开始, 结束)，单个季集时结束为None，无法解析时返回None
+    """
+    if not value:
+        return None
+    try:
+        numbers = [int(part.strip().upper().removeprefix(prefix)) for part in value.split("-")]
+    except ValueError:
+        return None
+    if len(numbers) == 1:
+        return numbers[0], None
+    if len(numbers) == 2:
+        return numbers[0], numbers[1]
+    return None
+
+
+@lru_cache(maxsize=4096)
+def _parse_meta(title: str) -> MetaBase:
+    """
+    解析种子标题的识别信息，按标题缓存
+    返回的对象在多处共享，需要修改时先复制
+    """
+    return MetaInfo(title)
+
+
+@dataclass(frozen=True, slots=True)
+class DownloadedCache:
+    """
+    单个订阅已下载的(季, 集)和整季下载的季
+    """
+    episodes: FrozenSet[Tuple[int, int]] = frozenset()
+    seasons: FrozenSet[int] = frozenset()
+
 
 class SubscriptionMultiVersion(_PluginBase):
     """
@@ -57,19 +303,22 @@ class SubscriptionMultiVersion(_PluginBase):
     auth_level = 1
 
     # 私有属性
-    _sites_helper: SitesHelper = None
-    _torrent_helper: TorrentHelper = None
-    _subscribe_helper: SubscribeHelper = None
-    _filter_module: FilterModule = None
-    _search_chain: SearchChain = None
-    _download_chain: DownloadChain = None
-    _downloader_helper: DownloaderHelper = None
-    _subscribe_oper: SubscribeOper = None
-    _download_history_oper: DownloadHistoryOper = None
     _enabled: bool = False
     _enable_search: bool = True
     _enable_filter: bool = True
     _default_filter_rules: str = ""
+    _cached_actions: List[Dict[str, Any]] = []
+    _cached_api: List[Dict[str, Any]] = []
+    # API响应缓存
+    _config_api_cache: TTLCache = None
+    _config_api_lock = threading.Lock()
+    # 下载历史解析结果缓存，键为(订阅ID, TMDBID)
+    _download_history_cache: TTLCache = None
+    _download_history_lock = threading.Lock()
+    # 并发搜索线程数
+    _search_thread_count: int = 2
+    # 搜索关键词数量上限
+    _max_search_names: Optional[int] = None
 
     def init_plugin(self, config: dict = None):
         """
@@ -80,18 +329,49 @@ class SubscriptionMultiVersion(_PluginBase):
             self._enable_search = config.get("enable_search", True)
             self._enable_filter = config.get("enable_filter", True)
             self._default_filter_rules = config.get("default_filter_rules", "")
+            try:
+                self._search_thread_count = max(int(config.get("search_thread_count") or 2), 1)
+            except (TypeError, ValueError):
+                self._search_thread_count = 2
+
+        # 搜索关键词数量上限
+        self._max_search_names = getattr(settings, 'MAX_SEARCH_NAME_LIMIT', None)
+
+        # 工作流动作和API只依赖配置，初始化时构建一次
+        self._cached_actions = self._build_actions()
+        self._cached_api = self._build_api()
+
+        # 标题解析结果依赖全局自定义识别词，重载时清空
+        _parse_meta.cache_clear()
+
+        # 配置变更后重建API响应缓存
+        self._config_api_cache = TTLCache(maxsize=1, ttl=5)
+        self._download_history_cache = TTLCache(maxsize=256, ttl=60)
+
+    # 助手在首次使用时创建，插件重载（保存配置）时不再重复构建
+    @cached_property
+    def _filter_module(self) -> FilterModule:
+        return FilterModule()
+
+    @cached_property
+    def _search_chain(self) -> SearchChain:
+        return SearchChain()
+
+    @cached_property
+    def _download_chain(self) -> DownloadChain:
+        return DownloadChain()
+
+    @cached_property
+    def _subscribe_oper(self) -> SubscribeOper:
+        return SubscribeOper()
+
+    @cached_property
+    def _download_history_oper(self) -> DownloadHistoryOper:
+        return DownloadHistoryOper()
 
-        # 初始化助手
-        self._sites_helper = SitesHelper()
-        self._torrent_helper = TorrentHelper()
-        self._subscribe_helper = SubscribeHelper()
-        self._filter_module = FilterModule()
-        self._search_chain = SearchChain()
-        self._download_chain = DownloadChain()
-        self._downloader_helper = DownloaderHelper()
-        self._subscribe_oper = SubscribeOper()
-        self._download_history_oper = DownloadHistoryOper()
-        self._media_chain = MediaChain()
+    @cached_property
+    def _media_chain(self) -> MediaChain:
+        return MediaChain()
 
     def get_state(self) -> bool:
         """
@@ -103,6 +383,12 @@ class SubscriptionMultiVersion(_PluginBase):
         """
         注册插件API
         """
+        return self._cached_api
+
+    def _build_api(self) -> List[Dict[str, Any]]:
+        """
+        构建插件API
+        """
         return [
             {
                 "path": "/query",
@@ -142,7 +428,6 @@ class SubscriptionMultiVersion(_PluginBase):
         """
         查询订阅种子API端点
         """
-        from fastapi import HTTPException
         try:
             if not self._enabled:
                 raise HTTPException(status_code=400, detail="插件未启用")
@@ -161,14 +446,13 @@ class SubscriptionMultiVersion(_PluginBase):
                 }
             }
         except Exception as e:
-            logger.error(f"查询订阅种子API调用失败: {str(e)}")
+            logger.error("查询订阅种子API调用失败: %s", e)
             raise HTTPException(status_code=500, detail=str(e))
 
     def filter_torrents_api(self):
         """
         过滤种子API端点
         """
-        from fastapi import HTTPException
         try:
             if not self._enabled:
                 raise HTTPException(status_code=400, detail="插件未启用")
@@ -187,31 +471,34 @@ class SubscriptionMultiVersion(_PluginBase):
                 }
             }
         except Exception as e:
-            logger.error(f"过滤种子API调用失败: {str(e)}")
+            logger.error("过滤种子API调用失败: %s", e)
             raise HTTPException(status_code=500, detail=str(e))
 
     def get_config_api(self):
         """
         获取插件配置API端点
         """
-        from fastapi import HTTPException
         try:
+            # TTLCache非线程安全，读写均需加锁
+            with self._config_api_lock:
+                response = self._config_api_cache.get("config")
+            if response:
+                return response
+
             config = self.get_config()
             if not config:
-                config = {
-                    "enabled": False,
-                    "enable_search": True,
-                    "enable_filter": True,
-                    "default_filter_rules": ""
-                }
+                config = dict(_FORM_MODEL)
 
-            return {
+            response = {
                 "success": True,
                 "message": "获取配置成功",
                 "data": config
             }
+            with self._config_api_lock:
+                self._config_api_cache["config"] = response
+            return response
         except Exception as e:
-            logger.error(f"获取配置API调用失败: {str(e)}")
+            logger.error("获取配置API调用失败: %s", e)
             raise HTTPException(status_code=500, detail=str(e))
 
     def get_status_api(self):
@@ -231,8 +518,7 @@ class SubscriptionMultiVersion(_PluginBase):
                 }
             }
         except Exception as e:
-            logger.error(f"获取状态API调用失败: {str(e)}")
-            from fastapi import HTTPException
+            logger.error("获取状态API调用失败: %s", e)
             raise HTTPException(status_code=500, detail=str(e))
 
     def get_actions(self) -> List[Dict[str, Any]]:
@@ -242,6 +528,12 @@ class SubscriptionMultiVersion(_PluginBase):
         if not self._enabled:
             return []
 
+        return self._cached_actions
+
+    def _build_actions(self) -> List[Dict[str, Any]]:
+        """
+        构建插件工作流动作
+        """
         actions = []
 
         # 订阅多版本过滤动作（合并查询和过滤）
@@ -260,7 +552,8 @@ class SubscriptionMultiVersion(_PluginBase):
                 "include": None,
                 "exclude": None,
                 "size": None,
-                "prioritize_downloaded": True
+                "prioritize_downloaded": True,
+                "max_results": None
             }
         })
 
@@ -278,29 +571,10 @@ class SubscriptionMultiVersion(_PluginBase):
             subscribe_ids = kwargs.get("subscribe_ids", [])
             search_sites = kwargs.get("search_sites", [])
 
-            # 获取过滤参数
-            rule_groups = kwargs.get("rule_groups", [])
-            quality = kwargs.get("quality")
-            resolution = kwargs.get("resolution")
-            effect = kwargs.get("effect")
-            include = kwargs.get("include")
-            exclude = kwargs.get("exclude")
-            size = kwargs.get("size")
-            prioritize_downloaded = kwargs.get("prioritize_downloaded", True)
-
-            logger.info(f"开始订阅多版本过滤，订阅ID: {subscribe_ids}, 站点: {search_sites}")
+            logger.info("开始订阅多版本过滤，订阅ID: %s, 站点: %s", subscribe_ids, search_sites)
 
             # 获取订阅信息
-            if context.subscribes:
-                # 从上下文中获取订阅
-                subscribes = context.subscribes
-            else:
-                # 从数据库查询订阅
-                if subscribe_ids:
-                    subscribes = [self._subscribe_oper.get(sid) for sid in subscribe_ids if
-                                  self._subscribe_oper.get(sid)]
-                else:
-                    subscribes = self._subscribe_oper.list()
+            subscribes = self._get_subscribes(context, subscribe_ids)
 
             if not subscribes:
                 logger.warning("未找到订阅信息")
@@ -309,113 +583,132 @@ class SubscriptionMultiVersion(_PluginBase):
             # 初始化结果
             all_torrents = []
             media_infos = []
-            downloaded_episodes = {}  # 记录已下载的集数，按订阅ID分组
+            # 本次动作内共享的媒体识别结果
+            media_cache: Dict[tuple, Optional[MediaInfo]] = {}
 
-            # 处理每个订阅
-            for subscribe in subscribes:
-                try:
-                    custom_word_list = subscribe.custom_words.split("\n") if subscribe.custom_words else None
-                    # 转换订阅为媒体信息
-                    media_info = self._convert_subscribe_to_media_info(subscribe)
+            # 多线程并发处理每个订阅，按订阅顺序逐个消费结果，不保留中间结果列表
+            with ThreadPool(min(len(subscribes), self._search_thread_count)) as p:
+                for media_info, filtered_torrents in p.imap(
+                        lambda sub: self._process_subscribe(sub, media_cache, **kwargs), subscribes):
                     if not media_info:
-                        logger.warning(f"订阅 {subscribe.name} 转换媒体信息失败，跳过处理")
                         continue
-
                     media_infos.append(media_info)
-
-                    valid_downloaded_torrents = []
-                    # 获取该订阅的已下载种子
-                    downloaded_torrents = self._get_downloaded_torrents_for_subscribe(subscribe, media_info)
-
-                    for torrent in downloaded_torrents:
-
-                        if TorrentHelper().filter_torrent(
-                                torrent_info=torrent.torrent_info,
-                                filter_params={
-                                    "quality": quality,
-                                    "resolution": resolution,
-                                    "effect": effect,
-                                    "include": include,
-                                    "exclude": exclude,
-                                    "size": size
-                                }
-                        ):
-                            if ActionChain().filter_torrents(
-                                    rule_groups=rule_groups,
-                                    torrent_list=[torrent.torrent_info],
-                                    mediainfo=torrent.media_info
-                            ):
-                                valid_downloaded_torrents.append(torrent)
-
-                    # 根据已下载的种子过滤缺失剧集
-                    filtered_no_exists = self._filter_no_exists_by_downloaded_torrents(
-                        subscribe=subscribe,
-                        media_info=media_info,
-                        valid_downloaded_torrents=valid_downloaded_torrents
-                    )
-
-                    # 搜索，同时电视剧会过滤掉不需要的剧集
-                    searchContexts = SearchChain().process(mediainfo=media_info,
-                                                           keyword=subscribe.keyword,
-                                                           no_exists=filtered_no_exists,
-                                                           sites=subscribe.sites,
-                                                           rule_groups=rule_groups,
-                                                           area="imdbid" if subscribe.search_imdbid else "title",
-                                                           custom_words=custom_word_list,
-                                                           filter_params=self.get_params(subscribe, **kwargs))
-
-                    # # 搜索站点种子（不包含已下载种子）
-                    # site_torrents = self._search_site_torrents(
-                    #     media_info,
-                    #     search_sites,
-                    #     subscribe
-                    # )
-
-                    # 过滤种子
-                    filtered_torrents = []
-                    for searchTorrent in searchContexts:
-
-                        if TorrentHelper().filter_torrent(
-                                torrent_info=searchTorrent.torrent_info,
-                                filter_params={
-                                    "quality": quality,
-                                    "resolution": resolution,
-                                    "effect": effect,
-                                    "include": include,
-                                    "exclude": exclude,
-                                    "size": size
-                                }
-                        ):
-                            if prioritize_downloaded and self._is_episode_covered_for_media(searchTorrent, media_info,
-                                                                                            downloaded_episodes.get(
-                                                                                                subscribe.id, set())):
-                                # 该种子的所有集数都已经被下载，跳过
-                                continue
-                            if ActionChain().filter_torrents(
-                                    rule_groups=rule_groups,
-                                    torrent_list=[searchTorrent.torrent_info],
-                                    mediainfo=searchTorrent.media_info
-                            ):
-                                filtered_torrents.append(searchTorrent)
-
                     all_torrents.extend(filtered_torrents)
 
-                except Exception as e:
-                    logger.error(f"处理订阅 {subscribe.name} 时出错: {str(e)}")
-                    continue
-
             # 更新上下文
             context.torrents = all_torrents
             context.medias = media_infos
             context.content = f"订阅多版本过滤完成，共找到 {len(all_torrents)} 个种子资源"
 
-            logger.info(f"订阅多版本过滤完成，共找到 {len(all_torrents)} 个种子")
+            logger.info("订阅多版本过滤完成，共找到 %d 个种子", len(all_torrents))
             return True, context
 
         except Exception as e:
-            logger.error(f"订阅多版本过滤失败: {str(e)}")
+            logger.error("订阅多版本过滤失败: %s", e)
             return False, context
 
+    def _process_subscribe(self, subscribe: Subscribe, media_cache: Dict[tuple, Optional[MediaInfo]] = None,
+                           **kwargs) -> Tuple[Optional[MediaInfo], List[Context]]:
+        """
+        处理单个订阅：识别媒体、过滤已下载种子、搜索并过滤站点种子
+        :param subscribe: 订阅信息
+        :param media_cache: 媒体识别结果缓存
+        :param kwargs: 动作参数
+        :return: (媒体信息, 过滤后的种子列表)，处理失败时媒体信息为None
+        """
+        # 获取过滤参数
+        rule_groups = kwargs.get("rule_groups", [])
+        quality = kwargs.get("quality")
+        resolution = kwargs.get("resolution")
+        effect = kwargs.get("effect")
+        include = kwargs.get("include")
+        exclude = kwargs.get("exclude")
+        size = kwargs.get("size")
+        prioritize_downloaded = kwargs.get("prioritize_downloaded", True)
+        # 每个订阅保留的最大搜索结果数，为None时不限制
+        max_results = kwargs.get("max_results")
+
+        try:
+            custom_word_list = subscribe.custom_words.split("\n") if subscribe.custom_words else None
+            # 转换订阅为媒体信息
+            media_info = self._convert_subscribe_to_media_info(subscribe, media_cache)
+            if not media_info:
+                logger.warning("订阅 %s 转换媒体信息失败，跳过处理", subscribe.name)
+                return None, []
+
+            filter_params = {
+                "quality": quality,
+                "resolution": resolution,
+                "effect": effect,
+                "include": include,
+                "exclude": exclude,
+                "size": size
+            }
+            action_chain = ActionChain()
+
+            # 获取该订阅的已下载种子，基础过滤后批量应用规则组过滤
+            downloaded_torrents = self._get_downloaded_torrents_for_subscribe(subscribe, media_info)
+            valid_downloaded_torrents = self._filter_by_rule_groups(
+                [torrent for torrent in downloaded_torrents
+                 if TorrentHelper.filter_torrent(torrent_info=torrent.torrent_info, filter_params=filter_params)],
+                rule_groups,
+                action_chain.filter_torrents
+            )
+            del downloaded_torrents
+            # 已下载集数未按订阅记录，集数覆盖检查使用空记录
+            downloaded = DownloadedCache()
+
+            # 根据已下载的种子过滤缺失剧集
+            filtered_no_exists = self._filter_no_exists_by_downloaded_torrents(
+                subscribe=subscribe,
+                media_info=media_info,
+                valid_downloaded_torrents=valid_downloaded_torrents
+            )
+
+            # 搜索，同时电视剧会过滤掉不需要的剧集
+            searchContexts = SearchChain().process(mediainfo=media_info,
+                                                   keyword=subscribe.keyword,
+                                                   no_exists=filtered_no_exists,
+                                                   sites=subscribe.sites,
+                                                   rule_groups=rule_groups,
+                                                   area="imdbid" if subscribe.search_imdbid else "title",
+                                                   custom_words=custom_word_list,
+                                                   filter_params=self.get_params(subscribe, **kwargs))
+            # 搜索结果已按优先级排序，超出上限的部分不再参与后续过滤
+            if max_results is not None and searchContexts and len(searchContexts) > max_results:
+                logger.info("订阅 %s 搜索到 %d 个种子，仅保留前 %d 个", subscribe.name, len(searchContexts), max_results)
+                del searchContexts[max_results:]
+
+            # # 搜索站点种子（不包含已下载种子）
+            # site_torrents = self._search_site_torrents(
+            #     media_info,
+            #     search_sites,
+            #     subscribe
+            # )
+
+            # 过滤种子：先进行基础过滤和集数覆盖检查，再批量应用规则组过滤
+            # 只有电视剧且存在已下载集数时才需要检查集数覆盖，循环外判断一次
+            check_covered = (prioritize_downloaded and media_info.type == MediaType.TV
+                             and bool(downloaded.episodes or downloaded.seasons))
+            candidates = []
+            for searchTorrent in searchContexts:
+                if not TorrentHelper.filter_torrent(torrent_info=searchTorrent.torrent_info,
+                                                    filter_params=filter_params):
+                    continue
+                if check_covered and self._is_episode_covered_for_media(searchTorrent, media_info, downloaded):
+                    # 该种子的所有集数都已经被下载，跳过
+                    continue
+                candidates.append(searchTorrent)
+            # 搜索结果已过滤完毕，尽早释放
+            del searchContexts
+            filtered_torrents = self._filter_by_rule_groups(candidates, rule_groups, action_chain.filter_torrents)
+
+            return media_info, filtered_torrents
+
+        except Exception as e:
+            logger.error("处理订阅 %s 时出错: %s", subscribe.name, e)
+            return None, []
+
     def query_subscribe_torrents(self, context: ActionContext, **kwargs) -> Tuple[bool, ActionContext]:
         """
         查询订阅种子动作
@@ -426,21 +719,15 @@ class SubscriptionMultiVersion(_PluginBase):
         try:
             # 获取参数
             subscribe_ids = kwargs.get("subscribe_ids", [])
-            search_sites = kwargs.get("search_sites", [])
+            # 站点集合在整个查询过程中只读，转换为frozenset后向下传递
+            search_sites = frozenset(kwargs.get("search_sites") or ())
+            # 每个关键词保留的最大结果数，为None时不限制
+            max_results = kwargs.get("max_results_per_keyword")
 
-            logger.info(f"开始查询订阅种子，订阅ID: {subscribe_ids}, 站点: {search_sites}")
+            logger.info("开始查询订阅种子，订阅ID: %s, 站点: %s", subscribe_ids, search_sites)
 
             # 获取订阅信息
-            if context.subscribes:
-                # 从上下文中获取订阅
-                subscribes = context.subscribes
-            else:
-                # 从数据库查询订阅
-                if subscribe_ids:
-                    subscribes = [self._subscribe_oper.get(sid) for sid in subscribe_ids if
-                                  self._subscribe_oper.get(sid)]
-                else:
-                    subscribes = self._subscribe_oper.list()
+            subscribes = self._get_subscribes(context, subscribe_ids)
 
             if not subscribes:
                 logger.warning("未找到订阅信息")
@@ -450,53 +737,114 @@ class SubscriptionMultiVersion(_PluginBase):
             all_torrents = []
             media_infos = []
 
-            # 处理每个订阅
-            for subscribe in subscribes:
-                try:
-                    # 转换订阅为媒体信息
-                    media_info = self._convert_subscribe_to_media_info(subscribe)
-                    if not media_info:
-                        logger.warning(f"订阅 {subscribe.name} 转换媒体信息失败，跳过处理")
-                        continue
-
-                    media_infos.append(media_info)
-
-                    # 搜索站点种子（不包含已下载种子）
-                    site_torrents = self._search_site_torrents(
-                        media_info,
-                        search_sites,
-                        subscribe
-                    )
-                    all_torrents.extend(site_torrents)
-
-                except Exception as e:
-                    logger.error(f"处理订阅 {subscribe.name} 时出错: {str(e)}")
+            # 同一关键词和站点的搜索结果、同一媒体的识别结果在本次动作内复用
+            search_cache: Dict[tuple, List[Context]] = {}
+            media_cache: Dict[tuple, Optional[MediaInfo]] = {}
+
+            # 多线程并发处理每个订阅，同时进行的站点搜索总数不超过线程数：
+            # 多个订阅并发时每个订阅的关键词依次搜索，只有一个订阅时关键词并发搜索
+            workers = min(len(subscribes), self._search_thread_count)
+            keyword_workers = self._search_thread_count if workers == 1 else 1
+            with ThreadPool(workers) as p:
+                results = p.map(lambda sub: self._query_subscribe(sub, search_sites, search_cache, media_cache,
+                                                                  max_results, keyword_workers),
+                                subscribes)
+
+            for media_info, site_torrents in results:
+                if not media_info:
                     continue
+                media_infos.append(media_info)
+                all_torrents.extend(site_torrents)
 
             # 更新上下文
             context.torrents = all_torrents
             context.medias = media_infos
             context.content = f"查询完成，共找到 {len(all_torrents)} 个种子资源"
 
-            logger.info(f"查询订阅种子完成，共找到 {len(all_torrents)} 个种子")
+            logger.info("查询订阅种子完成，共找到 %d 个种子", len(all_torrents))
             return True, context
 
         except Exception as e:
-            logger.error(f"查询订阅种子失败: {str(e)}")
+            logger.error("查询订阅种子失败: %s", e)
             return False, context
 
-    def _convert_subscribe_to_media_info(self, subscribe: Subscribe) -> Optional[MediaInfo]:
+    def _get_subscribes(self, context: ActionContext, subscribe_ids: List[int]) -> List[Subscribe]:
+        """
+        获取订阅信息，优先使用上下文中的订阅
+        """
+        if context.subscribes:
+            # 从上下文中获取订阅
+            return context.subscribes
+
+        # 从数据库查询订阅，按主键逐个查询，每个ID只查询一次
+        if subscribe_ids:
+            return [subscribe for sid in subscribe_ids if (subscribe := self._subscribe_oper.get(sid))]
+        return self._subscribe_oper.list()
+
+    def _query_subscribe(self, subscribe: Subscribe, search_sites: FrozenSet[str],
+                         search_cache: Dict[tuple, List[Context]] = None,
+                         media_cache: Dict[tuple, Optional[MediaInfo]] = None,
+                         max_results: Optional[int] = None,
+                         keyword_workers: int = 1
+                         ) -> Tuple[Optional[MediaInfo], List[Context]]:
+        """
+        查询单个订阅的种子
+        :param search_cache: 搜索结果缓存
+        :param media_cache: 媒体识别结果缓存
+        :param max_results: 每个关键词保留的最大结果数，为None时不限制
+        :param keyword_workers: 关键词并发搜索的线程数
+        :return: (媒体信息, 站点种子列表)，处理失败时媒体信息为None
+        """
+        try:
+            # 转换订阅为媒体信息
+            media_info = self._convert_subscribe_to_media_info(subscribe, media_cache)
+            if not media_info:
+                logger.warning("订阅 %s 转换媒体信息失败，跳过处理", subscribe.name)
+                return None, []
+
+            # 搜索站点种子（不包含已下载种子）
+            site_torrents = self._search_site_torrents(
+                media_info,
+                search_sites,
+                subscribe,
+                search_cache,
+                max_results,
+                keyword_workers
+            )
+            return media_info, site_torrents
+
+        except Exception as e:
+            logger.error("处理订阅 %s 时出错: %s", subscribe.name, e)
+            return None, []
+
+    def _convert_subscribe_to_media_info(self, subscribe: Subscribe,
+                                         media_cache: Dict[tuple, Optional[MediaInfo]] = None) -> Optional[MediaInfo]:
         """
         将订阅对象转换为媒体信息对象
         :param subscribe: 订阅对象
+        :param media_cache: 本次动作内的识别结果缓存，相同媒体的订阅只识别一次
         :return: 媒体信息对象
         """
+        cache_key = (subscribe.tmdbid, subscribe.doubanid, subscribe.bangumiid, subscribe.episode_group,
+                     subscribe.season, subscribe.type, subscribe.name, subscribe.year)
+        if media_cache is not None and cache_key in media_cache:
+            return media_cache[cache_key]
+
+        mediainfo = self._recognize_subscribe(subscribe)
+        if media_cache is not None:
+            media_cache[cache_key] = mediainfo
+        return mediainfo
+
+    def _recognize_subscribe(self, subscribe: Subscribe) -> Optional[MediaInfo]:
+        """
+        识别订阅对应的媒体信息
+        """
         try:
             # 构建元数据对象
             meta = MetaInfo(subscribe.name)
             meta.year = subscribe.year
             meta.begin_season = subscribe.season or None
-            meta.type = MediaType(subscribe.type)
+            meta.type = _media_type(subscribe.type)
 
             # 使用媒体识别链获取完整的媒体信息
             mediainfo: MediaInfo = self._media_chain.recognize_media(
@@ -510,17 +858,17 @@ class SubscriptionMultiVersion(_PluginBase):
             )
 
             if not mediainfo:
-                logger.warn(
-                    f'未识别到媒体信息，标题：{subscribe.name}，tmdbid：{subscribe.tmdbid}，doubanid：{subscribe.doubanid}')
+                logger.warn('未识别到媒体信息，标题：%s，tmdbid：%s，doubanid：%s',
+                            subscribe.name, subscribe.tmdbid, subscribe.doubanid)
                 return None
 
             return mediainfo
 
         except ValueError as e:
-            logger.error(f'订阅 {subscribe.name} 类型转换错误：{str(e)}')
+            logger.error('订阅 %s 类型转换错误：%s', subscribe.name, e)
             return None
         except Exception as e:
-            logger.error(f'转换订阅 {subscribe.name} 到媒体信息失败：{str(e)}')
+            logger.error('转换订阅 %s 到媒体信息失败：%s', subscribe.name, e)
             return None
 
     def filter_torrents(self, context: ActionContext, **kwargs) -> Tuple[bool, ActionContext]:
@@ -535,48 +883,67 @@ class SubscriptionMultiVersion(_PluginBase):
             filter_rules = kwargs.get("filter_rules", self._default_filter_rules)
             prioritize_downloaded = kwargs.get("prioritize_downloaded", True)
 
-            logger.info(f"开始过滤种子，规则: {filter_rules}")
+            logger.info("开始过滤种子，规则: %s", filter_rules)
 
             if not context.torrents and not context.subscribes:
                 logger.warning("上下文中没有种子资源和订阅信息")
                 return True, context
 
-            # 解析过滤规则
+            # 解析过滤规则，其中只有规则组参与过滤
             filter_params = self._parse_filter_rules(filter_rules)
 
             # 获取所有种子（包括已下载的种子）
             all_torrents = list(context.torrents or [])
 
+            # 低开销预过滤：剔除季/年份与所有订阅均不符的种子，减少后续过滤的数量
+            if context.subscribes:
+                all_torrents = [torrent for torrent in all_torrents
+                                if self._cheap_match(torrent, context.subscribes)]
+
+            # 没有待过滤的种子，无需再查询已下载种子
+            if not all_torrents:
+                context.torrents = []
+                context.content = "过滤完成，共 0 个种子通过过滤"
+                logger.info("没有待过滤的种子，跳过过滤")
+                return True, context
+
             # 如果有订阅信息，查询已下载的种子
+            downloaded_torrents = []
             if context.subscribes:
                 downloaded_torrents = self._get_downloaded_torrents_from_subscribes(context.subscribes)
                 # all_torrents.extend(downloaded_torrents)
 
             # 过滤种子
-            filtered_torrents = []
-            downloaded_episodes = set()  # 记录已下载的集数
+            rule_groups = filter_params.get("rule_groups")
+            covered_episodes = set()  # 记录已下载的集数
+            covered_seasons = set()  # 记录已整季下载的季
+
+            # 预先提取热循环需要的字段为平行列表，后续按索引读取
+            torrents = downloaded_torrents + all_torrents
+            downloaded_flags = [self._is_downloaded_torrent(torrent) for torrent in torrents]
+            episode_keys = [self._episode_key(torrent) for torrent in torrents]
+
+            # 一次遍历完成已下载/搜索种子的分类
+            valid_downloaded = []
+            candidate_indexes = []
+            for index, torrent in enumerate(torrents):
+                if downloaded_flags[index]:
+                    valid_downloaded.append(torrent)
+                else:
+                    candidate_indexes.append(index)
 
-            # 首先处理已下载的种子
-            for torrent in downloaded_torrents:
-                if torrent.meta_info and torrent.meta_info.org_string and torrent.meta_info.org_string.startswith(
-                        "downloaded:"):
-                    # 检查已下载种子是否通过过滤
-                    if self._check_torrent_filter(torrent, filter_params):
-                        # 记录已下载的集数
-                        self._record_downloaded_episodes(torrent, downloaded_episodes)
-                        # filtered_torrents.append(torrent)
-
-            # 处理搜索到的种子
-            for torrent in all_torrents:
-                if not (torrent.meta_info and torrent.meta_info.org_string and torrent.meta_info.org_string.startswith(
-                        "downloaded:")):
-                    # 检查是否已经被已下载种子覆盖
-                    if self._is_episode_covered(torrent, downloaded_episodes):
-                        continue
+            # 记录通过规则组过滤的已下载集数
+            passed_downloaded = {id(torrent) for torrent in self._filter_by_rule_groups(valid_downloaded, rule_groups)}
+            for index, torrent in enumerate(torrents):
+                if id(torrent) in passed_downloaded:
+                    self._record_downloaded_episodes(episode_keys[index], covered_episodes, covered_seasons)
+
+            # 剔除已经被已下载种子覆盖的搜索种子
+            candidates = [torrents[index] for index in candidate_indexes
+                          if not self._is_episode_covered(episode_keys[index], covered_episodes, covered_seasons)]
 
-                    # 应用过滤规则
-                    if self._check_torrent_filter(torrent, filter_params):
-                        filtered_torrents.append(torrent)
+            # 批量应用规则组过滤
+            filtered_torrents = self._filter_by_rule_groups(candidates, rule_groups)
 
             # 更新上下文
             context.torrents = filtered_torrents
@@ -586,11 +953,11 @@ class SubscriptionMultiVersion(_PluginBase):
             if filtered_torrents and context.subscribes:
                 self._update_subscribe_status(filtered_torrents, context.subscribes)
 
-            logger.info(f"种子过滤完成，共 {len(filtered_torrents)} 个种子通过过滤")
+            logger.info("种子过滤完成，共 %d 个种子通过过滤", len(filtered_torrents))
             return True, context
 
         except Exception as e:
-            logger.error(f"种子过滤失败: {str(e)}")
+            logger.error("种子过滤失败: %s", e)
             return False, context
 
     def _get_downloaded_torrents_from_subscribes(self, subscribes: List[Subscribe]) -> List[Context]:
@@ -606,43 +973,65 @@ class SubscriptionMultiVersion(_PluginBase):
                 # 使用DownloadChain获取下载器中的种子
                 torrents = self._download_chain.get_downloading_torrents()
 
+                # 有TMDBID的订阅按TMDBID建立索引，值为这些订阅的季集关键字
+                # 种子带TMDBID时直接查找，TMDBID相同仍需匹配订阅的季集
+                sub_tmdbids: Dict[int, List[Tuple[str, ...]]] = {}
+                for subscribe in subscribes:
+                    if subscribe.tmdbid:
+                        season_needles = sub_tmdbids.setdefault(int(subscribe.tmdbid), [])
+                        needles = _season_needles_for_subscribe(subscribe.type, subscribe.season, subscribe.episode)
+                        if needles not in season_needles:
+                            season_needles.append(needles)
+                # 每个订阅只构建一次匹配关键字，供所有种子复用
+                # 关键字相同的订阅（如重复订阅同一剧集）只需匹配一次
+                sub_needles = list(dict.fromkeys(self._compile_match_needles(subscribe)
+                                                 for subscribe in subscribes))
+                # 种子带TMDBID时，只需再按关键字匹配没有TMDBID的订阅
+                untagged_needles = list(dict.fromkeys(self._compile_match_needles(subscribe)
+                                                      for subscribe in subscribes if not subscribe.tmdbid))
+
                 for torrent in torrents:
-                    # 检查种子是否匹配任何一个订阅
-                    for subscribe in subscribes:
-                        media_info = MediaInfo()
-                        media_info.title = subscribe.name
-                        media_info.year = subscribe.year
-                        media_info.type = MediaType(subscribe.type)
-                        media_info.tmdb_id = subscribe.tmdbid
-                        media_info.season = subscribe.season
-                        media_info.episode = subscribe.episode
-                        media_info.total_episode = subscribe.total_episode
-
-                        if self._match_torrent_to_subscribe(torrent, subscribe, media_info):
-                            # 转换为Context对象
-                            context_obj = Context()
-                            context_obj.torrent_info = torrent
-                            # 将下载信息存储在meta_info中
-                            context_obj.meta_info = MetaInfo(title=torrent.title)
-                            context_obj.meta_info.org_string = f"downloaded:unknown"
-                            downloaded_torrents.append(context_obj)
-                            break  # 匹配到一个订阅就停止
+                    torrent_tmdbid = self._get_torrent_tmdbid(torrent)
+                    if torrent_tmdbid:
+                        season_candidates = sub_tmdbids.get(torrent_tmdbid, [])
+                        needle_candidates = untagged_needles
+                    else:
+                        season_candidates = []
+                        needle_candidates = sub_needles
+                    # 种子标题只转换一次小写
+                    torrent_title = (torrent.title or "").lower()
+                    matched = any(self._match_torrent_to_subscribe(torrent_title, needles)
+                                  for needles in season_candidates + needle_candidates)
+                    if matched:
+                        # 转换为Context对象
+                        context_obj = Context()
+                        context_obj.torrent_info = torrent
+                        # 将下载信息存储在meta_info中
+                        context_obj.meta_info = copy.copy(_parse_meta(torrent.title or ""))
+                        context_obj.meta_info.org_string = f"{_DOWNLOADED_PREFIX}unknown"
+                        context_obj._is_downloaded = True
+                        downloaded_torrents.append(context_obj)
 
             except Exception as e:
-                logger.error(f"获取已下载种子失败: {str(e)}")
+                logger.error("获取已下载种子失败: %s", e)
                 # 返回空列表而不是继续，避免错误传播
 
-            logger.info(f"从下载器获取到 {len(downloaded_torrents)} 个已下载种子")
+            logger.info("从下载器获取到 %d 个已下载种子", len(downloaded_torrents))
             return downloaded_torrents
 
         except Exception as e:
-            logger.error(f"获取已下载种子失败: {str(e)}")
+            logger.error("获取已下载种子失败: %s", e)
             return []
 
-    def _search_site_torrents(self, media_info: MediaInfo, search_sites: List[str], subscribe: Subscribe) -> List[
-        Context]:
+    def _search_site_torrents(self, media_info: MediaInfo, search_sites: FrozenSet[str], subscribe: Subscribe,
+                              search_cache: Dict[tuple, List[Context]] = None,
+                              max_results: Optional[int] = None,
+                              keyword_workers: int = 1) -> List[Context]:
         """
         搜索站点种子
+        :param search_cache: 本次动作内共享的搜索结果缓存，键为(关键词, 站点)
+        :param max_results: 每个关键词保留的最大结果数，为None时不限制
+        :param keyword_workers: 关键词并发搜索的线程数，为1时依次搜索
         """
         try:
             site_torrents = []
@@ -656,46 +1045,88 @@ class SubscriptionMultiVersion(_PluginBase):
                 "media_type": media_info.type.value,
                 "season_episodes": season_episodes,
                 "year": media_info.year,
-                "sites": search_sites if search_sites else None
+                "sites": list(search_sites) if search_sites else None
             }
 
-            # 执行搜索（支持多个关键词）
-            search_results = []
+            # 命中缓存的关键词直接复用，其余关键词搜索
+            keyword_results: Dict[str, List[Context]] = {}
             for keyword in search_params["keywords"]:
-                results = self._search_chain.search_by_title(
-                    keyword,
-                    sites=search_params["sites"]
-                )
-                search_results.extend(results)
-
-            for result in search_results:
-                try:
-                    # 转换为Context对象
-                    result.context = {
-                        "downloaded": False,
-                        "site": result.torrent_info.site_name,
-                        "search_time": datetime.now().isoformat(),
-                        "subscribe_id": subscribe.id
-                    }
-                    site_torrents.append(result)
-
-                except Exception as e:
-                    logger.error(f"处理搜索结果失败: {str(e)}")
-                    continue
+                if search_cache is not None and (keyword, search_sites or None) in search_cache:
+                    keyword_results[keyword] = search_cache[(keyword, search_sites or None)]
+            missing_keywords = [keyword for keyword in search_params["keywords"] if keyword not in keyword_results]
+            if missing_keywords:
+                if keyword_workers > 1 and len(missing_keywords) > 1:
+                    with ThreadPool(min(len(missing_keywords), keyword_workers)) as p:
+                        fetched = p.map(lambda kw: self._search_keyword(kw, search_params["sites"], max_results),
+                                        missing_keywords)
+                else:
+                    fetched = [self._search_keyword(keyword, search_params["sites"], max_results)
+                               for keyword in missing_keywords]
+                for keyword, results in zip(missing_keywords, fetched):
+                    keyword_results[keyword] = results
+                    if search_cache is not None:
+                        search_cache[(keyword, search_sites or None)] = results
+
+            if not any(keyword_results.values()):
+                logger.info("从站点搜索到 0 个种子")
+                return site_torrents
+
+            # 同一次搜索的结果共用搜索时间，在全部关键词搜索完成后取一次
+            search_time = datetime.now().isoformat()
+
+            # 按关键词顺序处理搜索结果，结果直接写入输出列表
+            # 不同关键词可能搜索到同一种子，按站点+下载链接去重
+            seen = set()
+            for keyword in search_params["keywords"]:
+                for result in keyword_results[keyword]:
+                    try:
+                        torrent_info = result.torrent_info
+                        torrent_key = (torrent_info.site,
+                                       torrent_info.enclosure or torrent_info.page_url or torrent_info.title)
+                        if torrent_key in seen:
+                            continue
+                        seen.add(torrent_key)
+                        # 复制结果，避免多个订阅共享同一对象时相互覆盖context
+                        result = copy.copy(result)
+                        # 转换为Context对象
+                        result.context = {
+                            "downloaded": False,
+                            "site": result.torrent_info.site_name,
+                            "search_time": search_time,
+                            "subscribe_id": subscribe.id
+                        }
+                        site_torrents.append(result)
+
+                    except Exception as e:
+                        logger.error("处理搜索结果失败: %s", e)
+                        continue
 
-            logger.info(f"从站点搜索到 {len(site_torrents)} 个种子")
+            logger.info("从站点搜索到 %d 个种子", len(site_torrents))
             return site_torrents
 
         except Exception as e:
-            logger.error(f"搜索站点种子失败: {str(e)}")
+            logger.error("搜索站点种子失败: %s", e)
+            return []
+
+    def _search_keyword(self, keyword: str, sites: Optional[List[str]],
+                        max_results: Optional[int] = None) -> List[Context]:
+        """
+        按单个关键词搜索站点种子，设置max_results时最多保留max_results个结果，失败时返回空列表
+        """
+        try:
+            results = self._search_chain.search_by_title(keyword, sites=sites) or []
+            if max_results is not None and len(results) > max_results:
+                logger.info("关键词 %s 搜索到 %d 个种子，仅保留前 %d 个", keyword, len(results), max_results)
+                del results[max_results:]
+            return results
+        except Exception as e:
+            logger.error("关键词 %s 搜索失败: %s", keyword, e)
             return []
 
     def _prepare_search_params(self, mediainfo: MediaInfo) -> Tuple[Dict[int, List[int]], List[str]]:
         """
         准备搜索参数（参考app/chain/search.py的__prepare_params方法）
         """
-        from app.core.config import settings
-
         # 缺失的季集（这里简化处理，如果没有no_exists参数则使用当前季）
         if mediainfo.season:
             season_episodes = {mediainfo.season: []}
@@ -715,45 +1146,78 @@ class SubscriptionMultiVersion(_PluginBase):
         ]))
 
         # 限制搜索关键词数量
-        if hasattr(settings, 'MAX_SEARCH_NAME_LIMIT') and settings.MAX_SEARCH_NAME_LIMIT:
-            keywords = keywords[:settings.MAX_SEARCH_NAME_LIMIT]
+        if self._max_search_names:
+            keywords = keywords[:self._max_search_names]
 
         return season_episodes, keywords
 
-    def _match_torrent_to_subscribe(self, torrent, subscribe: Subscribe, media_info: MediaInfo) -> bool:
+    @staticmethod
+    def _compile_match_needles(subscribe: Subscribe) -> Tuple[str, ...]:
         """
-        检查种子是否匹配订阅
+        获取订阅的匹配关键字
         """
-        try:
-            # 简单的标题匹配逻辑
-            torrent_title = torrent.title.lower()
-            subscribe_title = media_info.title.lower()
+        return _match_needles_for_subscribe(
+            subscribe.name,
+            subscribe.year,
+            subscribe.type,
+            subscribe.season,
+            subscribe.episode
+        )
 
-            # 检查标题是否包含
-            if subscribe_title not in torrent_title:
-                return False
+    @staticmethod
+    def _get_torrent_tmdbid(torrent: Any) -> Optional[int]:
+        """
+        获取下载器种子对应的TMDBID，没有时返回None
+        下载器种子没有识别信息，TMDBID来自其media字段（按下载历史填充）
+        """
+        media = getattr(torrent, "media", None)
+        tmdbid = media.get("tmdbid") if isinstance(media, dict) else None
+        if not tmdbid:
+            return None
+        try:
+            return int(tmdbid)
+        except (TypeError, ValueError):
+            return None
 
-            # 检查年份
-            if media_info.year and str(media_info.year) not in torrent_title:
+    @staticmethod
+    def _match_torrent_to_subscribe(torrent_title: str, needles: Tuple[str, ...]) -> bool:
+        """
+        按标题关键字检查种子是否匹配订阅
+        :param torrent_title: 小写的种子标题
+        :param needles: _compile_match_needles 生成的匹配关键字
+        """
+        for needle in needles:
+            if needle not in torrent_title:
                 return False
+        return True
 
-            # 检查季集信息
-            if media_info.type == MediaType.TV:
-                if media_info.season:
-                    season_str = f"s{media_info.season:02d}"
-                    if season_str not in torrent_title.lower():
-                        return False
-
-                if media_info.episode:
-                    episode_str = f"e{media_info.episode:02d}"
-                    if episode_str not in torrent_title.lower():
-                        return False
+    @staticmethod
+    def _cheap_match(torrent: Context, subscribes: List[Subscribe]) -> bool:
+        """
+        低开销预过滤，种子解析出的季/年份与任一订阅相符即通过
+        标题因存在中英文名差异不在此处比较
+        """
+        meta_info = torrent.meta_info
+        if not meta_info or not subscribes:
+            return True
 
+        # 标题未标明季时季列表默认为第1季，不能据此剔除，只有明确标明季的种子才比较
+        season_list = meta_info.season_list if meta_info.begin_season is not None else None
+        for subscribe in subscribes:
+            if subscribe.type == MediaType.TV.value:
+                # 电视剧检查季
+                if subscribe.season and season_list and subscribe.season not in season_list:
+                    continue
+            elif meta_info.year and subscribe.year:
+                # 电影检查年份，允许前后一年误差
+                try:
+                    if abs(int(meta_info.year) - int(subscribe.year)) > 1:
+                        continue
+                except (TypeError, ValueError):
+                    pass
             return True
 
-        except Exception as e:
-            logger.error(f"匹配种子到订阅失败: {str(e)}")
-            return False
+        return False
 
     def _parse_filter_rules(self, rules_str: str) -> Dict[str, Any]:
         """
@@ -763,78 +1227,117 @@ class SubscriptionMultiVersion(_PluginBase):
             if not rules_str:
                 return {}
 
-            # 简单的JSON解析
-            try:
-                return json.loads(rules_str)
-            except json.JSONDecodeError:
-                # 如果不是JSON，尝试解析键值对
-                rules = {}
-                for rule in rules_str.split(","):
-                    if "=" in rule:
-                        key, value = rule.split("=", 1)
-                        rules[key.strip()] = value.strip()
-                return rules
+            # 返回副本，避免调用方修改缓存内容
+            return dict(_parse_filter_rules_cached(rules_str))
 
         except Exception as e:
-            logger.error(f"解析过滤规则失败: {str(e)}")
+            logger.error("解析过滤规则失败: %s", e)
             return {}
 
-    def _check_torrent_filter(self, torrent: Context, filter_params: Dict[str, Any]) -> bool:
+    @staticmethod
+    def _basic_filter_params(filter_params: Dict[str, Any]) -> Dict[str, Any]:
         """
-        检查种子是否通过过滤
+        提取基础属性过滤参数（质量、分辨率、大小等）
+        规则组过滤开销最高，由 _filter_by_rule_groups 批量执行，不包含在内
         """
-        try:
-            # 使用MoviePilot的过滤模块
-            if not filter_params:
-                return True
+        if not filter_params:
+            return {}
+        return {key: value for key, value in filter_params.items()
+                if key != "rule_groups" and value is not None}
 
-            # 调用过滤模块
-            filtered_torrents = self._filter_module.filter_torrents(
-                filter_params.get("rule_groups", []),
-                [torrent.torrent_info],
-                torrent.media_info
-            )
-            return len(filtered_torrents) > 0
+    def _check_torrent_filter(self, torrent: Context, basic_params: Dict[str, Any]) -> bool:
+        """
+        检查搜索种子是否通过基础过滤，未设置过滤参数时直接通过
+        """
+        if not basic_params:
+            return True
+
+        try:
+            return TorrentHelper.filter_torrent(torrent.torrent_info, basic_params)
 
         except Exception as e:
-            logger.error(f"检查种子过滤失败: {str(e)}")
+            logger.error("检查种子过滤失败: %s", e)
             return False
 
-    def _record_downloaded_episodes(self, torrent: Context, downloaded_episodes: set):
+    def _filter_by_rule_groups(self, torrents: List[Context], rule_groups: List[str],
+                               filter_func: Callable = None) -> List[Context]:
         """
-        记录已下载的集数
+        规则组过滤，按媒体信息分组后每组只调用一次过滤模块
+        :param filter_func: 过滤函数，参数为(规则组, 种子列表, 媒体信息)，默认使用过滤模块
         """
-        try:
-            media_info = torrent.media_info
-            if media_info and media_info.type == MediaType.TV:
-                if media_info.episode:
-                    downloaded_episodes.add(media_info.episode)
-                elif media_info.season:
-                    # 整季下载
-                    downloaded_episodes.add(f"s{media_info.season}")
+        if not rule_groups or not torrents:
+            return torrents
 
-        except Exception as e:
-            logger.error(f"记录已下载集数失败: {str(e)}")
+        if not filter_func:
+            filter_func = self._filter_module.filter_torrents
 
-    def _is_episode_covered(self, torrent: Context, downloaded_episodes: set) -> bool:
+        # 按媒体信息分组
+        groups: Dict[int, List[Context]] = {}
+        for torrent in torrents:
+            groups.setdefault(id(torrent.media_info), []).append(torrent)
+
+        passed_ids = set()
+        for group in groups.values():
+            try:
+                filtered_infos = filter_func(
+                    rule_groups,
+                    [torrent.torrent_info for torrent in group],
+                    group[0].media_info
+                )
+                passed_ids.update(id(torrent_info) for torrent_info in filtered_infos or [])
+            except Exception as e:
+                logger.error("规则组过滤失败: %s", e)
+
+        return [torrent for torrent in torrents if id(torrent.torrent_info) in passed_ids]
+
+    @staticmethod
+    def _is_downloaded_torrent(torrent: Context) -> bool:
         """
-        检查集数是否已被覆盖
+        判断是否为已下载种子，已下载种子在创建时带有 _is_downloaded 标记
         """
-        try:
-            media_info = torrent.media_info
-            if not media_info or media_info.type != MediaType.TV:
-                return False
+        return getattr(torrent, "_is_downloaded", False)
 
-            if media_info.episode:
-                return media_info.episode in downloaded_episodes
-            elif media_info.season:
-                return f"s{media_info.season}" in downloaded_episodes
+    @staticmethod
+    def _episode_key(torrent: Context) -> Tuple[Optional[int], Optional[int]]:
+        """
+        提取种子的(集, 季)，非电视剧返回(None, None)
+        """
+        media_info = torrent.media_info
+        if not media_info or media_info.type != MediaType.TV:
+            return None, None
+        return media_info.episode, media_info.season
 
-            return False
+    @staticmethod
+    def _record_downloaded_episodes(episode_key: Tuple[Optional[int], Optional[int]],
+                                    covered_episodes: Set[int], covered_seasons: Set[int]):
+        """
+        记录已下载的集数
+        :param episode_key: _episode_key 提取的(集, 季)
+        :param covered_episodes: 已下载的集数
+        :param covered_seasons: 已整季下载的季
+        """
+        episode, season = episode_key
+        if episode:
+            covered_episodes.add(episode)
+        elif season:
+            # 整季下载
+            covered_seasons.add(season)
 
-        except Exception as e:
-            logger.error(f"检查集数覆盖失败: {str(e)}")
-            return False
+    @staticmethod
+    def _is_episode_covered(episode_key: Tuple[Optional[int], Optional[int]],
+                            covered_episodes: Set[int], covered_seasons: Set[int]) -> bool:
+        """
+        检查集数是否已被覆盖
+        :param episode_key: _episode_key 提取的(集, 季)
+        :param covered_episodes: 已下载的集数
+        :param covered_seasons: 已整季下载的季
+        """
+        episode, season = episode_key
+        if episode:
+            return episode in covered_episodes
+        elif season:
+            return season in covered_seasons
+        return False
 
     def _update_subscribe_status(self, filtered_torrents: List[Context], subscribes: List[Subscribe]):
         """
@@ -843,8 +1346,7 @@ class SubscriptionMultiVersion(_PluginBase):
         try:
             # 更新订阅状态逻辑
             for torrent in filtered_torrents:
-                if torrent.meta_info and torrent.meta_info.org_string and torrent.meta_info.org_string.startswith(
-                        "downloaded:"):
+                if self._is_downloaded_torrent(torrent):
                     # 已下载种子通过过滤，更新对应订阅状态
                     # 这里需要从org_string中解析subscribe_id，或者使用其他方式存储
                     # 由于当前实现没有存储subscribe_id，这里只是示例
@@ -854,125 +1356,13 @@ class SubscriptionMultiVersion(_PluginBase):
                     )
 
         except Exception as e:
-            logger.error(f"更新订阅状态失败: {str(e)}")
+            logger.error("更新订阅状态失败: %s", e)
 
     def get_form(self) -> Tuple[List[dict], Dict[str, Any]]:
         """
         拼装插件配置页面，需要返回两块数据：1、页面配置；2、数据结构
         """
-        return [
-            {
-                'component': 'VForm',
-                'content': [
-                    {
-                        'component': 'VRow',
-                        'content': [
-                            {
-                                'component': 'VCol',
-                                'props': {
-                                    'cols': 12,
-                                    'md': 4
-                                },
-                                'content': [
-                                    {
-                                        'component': 'VSwitch',
-                                        'props': {
-                                            'model': 'enabled',
-                                            'label': '启用插件',
-                                        }
-                                    }
-                                ]
-                            },
-                            {
-                                'component': 'VCol',
-                                'props': {
-                                    'cols': 12,
-                                    'md': 4
-                                },
-                                'content': [
-                                    {
-                                        'component': 'VSwitch',
-                                        'props': {
-                                            'model': 'enable_search',
-                                            'label': '启用查询功能',
-                                        }
-                                    }
-                                ]
-                            },
-                            {
-                                'component': 'VCol',
-                                'props': {
-                                    'cols': 12,
-                                    'md': 4
-                                },
-                                'content': [
-                                    {
-                                        'component': 'VSwitch',
-                                        'props': {
-                                            'model': 'enable_filter',
-                                            'label': '启用过滤功能',
-                                        }
-                                    }
-                                ]
-                            }
-                        ]
-                    },
-                    {
-                        'component': 'VRow',
-                        'content': [
-                            {
-                                'component': 'VCol',
-                                'props': {
-                                    'cols': 12
-                                },
-                                'content': [
-                                    {
-                                        'component': 'VTextarea',
-                                        'props': {
-                                            'model': 'default_filter_rules',
-                                            'label': '默认过滤规则',
-                                            'placeholder': '默认的过滤规则，JSON格式或键值对格式',
-                                            'rows': 4,
-                                            'hint': '默认的过滤规则，JSON格式或键值对格式',
-                                            'persistent-hint': True
-                                        }
-                                    }
-                                ]
-                            }
-                        ]
-                    },
-                    {
-                        'component': 'VRow',
-                        'content': [
-                            {
-                                'component': 'VCol',
-                                'props': {
-                                    'cols': 12
-                                },
-                                'content': [
-                                    {
-                                        'component': 'VAlert',
-                                        'props': {
-                                            'type': 'info',
-                                            'variant': 'tonal',
-                                            'text': '订阅多资源版本订阅插件提供基于订阅的多资源版本管理和过滤功能。'
-                                                    '启用查询功能后，插件会根据订阅信息查询种子资源。'
-                                                    '启用过滤功能后，插件会根据设定的规则过滤种子资源。'
-                                                    '过滤规则支持JSON格式或键值对格式。'
-                                        }
-                                    }
-                                ]
-                            }
-                        ]
-                    }
-                ]
-            }
-        ], {
-            "enabled": False,
-            "enable_search": True,
-            "enable_filter": True,
-            "default_filter_rules": ""
-        }
+        return _FORM_CONTENT, _FORM_MODEL
 
     def get_page(self) -> List[dict]:
         """
@@ -986,16 +1376,28 @@ class SubscriptionMultiVersion(_PluginBase):
         """
         pass
 
+    @eventmanager.register(EventType.DownloadAdded)
+    def download_added(self, event: Event):
+        """
+        添加下载事件，下载历史发生变化，清空已下载种子缓存
+        """
+        if not self._download_history_cache:
+            return
+        with self._download_history_lock:
+            self._download_history_cache.clear()
+
     def _get_downloaded_torrents_for_subscribe(self, subscribe: Subscribe, media_info: MediaInfo) -> List[Context]:
         """
         根据订阅获取已下载的种子
+        下载历史的解析结果短时间缓存、新增下载时清空，Context对象每次按当前媒体信息重新构建
         """
         try:
-            downloaded_torrents = []
+            cache_key = (subscribe.id, media_info.tmdb_id)
+            with self._download_history_lock:
+                entries = self._download_history_cache.get(cache_key)
 
-            # 使用下载历史获取已下载的种子
-            try:
-                # 查询该订阅的下载历史
+            if entries is None:
+                # 使用下载历史获取已下载的种子，查询该订阅的下载历史
                 if media_info.tmdb_id:
                     download_history = self._download_history_oper.get_by_mediaid(
                         tmdbid=media_info.tmdb_id,
@@ -1003,68 +1405,115 @@ class SubscriptionMultiVersion(_PluginBase):
                     )
                 else:
                     download_history = []
-
-                for history in download_history:
-                    # 转换为Context对象
-                    context_obj = Context()
-                    # 创建TorrentInfo对象
-                    torrent_info = TorrentInfo(
-                        title=history.torrent_name or "",
-                        site=history.torrent_site or "",
-                        description=history.torrent_description or "",
-                        size=0  # 下载历史中没有大小信息
-                    )
-                    context_obj.torrent_info = torrent_info
-                    context_obj.media_info = media_info
-                    # 将下载信息存储在meta_info中
-                    context_obj.meta_info = MetaInfo(title=history.torrent_name or "")
-                    context_obj.meta_info.org_string = f"downloaded:{subscribe.id}"
-                    downloaded_torrents.append(context_obj)
-
-            except Exception as e:
-                logger.error(f"获取已下载种子失败: {str(e)}")
-
-            logger.info(f"从下载历史获取到 {len(downloaded_torrents)} 个已下载种子")
+                entries = [(self._meta_from_history(history),
+                            history.torrent_name or "",
+                            history.torrent_site or "",
+                            history.torrent_description or "")
+                           for history in download_history]
+                with self._download_history_lock:
+                    self._download_history_cache[cache_key] = entries
+
+            # 同一订阅的已下载标记相同，只构建一次
+            org_string = f"{_DOWNLOADED_PREFIX}{subscribe.id}"
+            downloaded_torrents = [self._build_downloaded_context(entry, media_info, org_string)
+                                   for entry in entries]
+
+            logger.info("从下载历史获取到 %d 个已下载种子", len(downloaded_torrents))
             return downloaded_torrents
 
         except Exception as e:
-            logger.error(f"获取已下载种子失败: {str(e)}")
+            logger.error("获取已下载种子失败: %s", e)
             return []
 
-    def _record_downloaded_episodes_for_subscribe(self, subscribe_id: int, downloaded_torrents: List[Context],
-                                                  downloaded_episodes: dict):
+    @staticmethod
+    def _build_downloaded_context(entry: Tuple[MetaBase, str, str, str], media_info: MediaInfo,
+                                  org_string: str) -> Context:
+        """
+        将下载历史转换为已下载种子的Context对象
+        :param entry: (识别信息, 种子名称, 站点, 描述)，识别信息为缓存共享对象，复制后再修改
+        :param org_string: 写入meta_info的已下载标记
+        """
+        meta, title, site, description = entry
+        # 将下载信息存储在meta_info中
+        meta_info = copy.copy(meta)
+        meta_info.org_string = org_string
+        context_obj = Context(
+            meta_info=meta_info,
+            media_info=media_info,
+            torrent_info=TorrentInfo(
+                title=title,
+                site=site,
+                description=description,
+                size=0  # 下载历史中没有大小信息
+            )
+        )
+        context_obj._is_downloaded = True
+        return context_obj
+
+    @staticmethod
+    def _meta_from_history(history: DownloadHistory) -> MetaBase:
+        """
+        根据下载历史记录的季集构建识别信息，未记录季集时才解析种子标题
+        返回的对象可能是缓存共享对象，需要修改时先复制
+        """
+        title = history.torrent_name or ""
+        seasons = _parse_range(history.seasons, "S")
+        if not seasons:
+            return _parse_meta(title)
+        episodes = _parse_range(history.episodes, "E")
+        if history.episodes and not episodes:
+            return _parse_meta(title)
+
+        meta = MetaBase(title)
+        meta.title = title
+        meta.type = MediaType.TV
+        meta.begin_season, meta.end_season = seasons
+        if episodes:
+            meta.begin_episode, meta.end_episode = episodes
+        return meta
+
+    @staticmethod
+    def _record_downloaded_episodes_for_subscribe(downloaded_torrents: List[Context],
+                                                  season: Optional[int] = None) -> DownloadedCache:
         """
-        记录已下载的集数（按订阅ID分组）
+        记录单个订阅已下载的集数，集数按(季, 集)记录，没有季信息的种子无法确定归属，不记录
+        :param season: 订阅的季，下载历史包含该剧所有季，只记录该季的种子
+        :return: 已下载的(季, 集)和整季下载的季
         """
-        try:
-            if subscribe_id not in downloaded_episodes:
-                downloaded_episodes[subscribe_id] = set()
+        if not downloaded_torrents:
+            return DownloadedCache()
 
+        downloaded_episodes: Set[Tuple[int, int]] = set()
+        downloaded_seasons: Set[int] = set()
+        try:
             for torrent in downloaded_torrents:
                 meta_info = torrent.meta_info
                 if not meta_info:
                     continue
+                torrent_season = meta_info.begin_season
+                if torrent_season is None or (season and torrent_season != season):
+                    continue
 
                 # 从种子的meta_info中获取集数信息
                 if meta_info.episode_list:
                     # 多集种子：记录每一集
-                    for episode in meta_info.episode_list:
-                        downloaded_episodes[subscribe_id].add(episode)
+                    downloaded_episodes.update((torrent_season, episode) for episode in meta_info.episode_list)
                 elif meta_info.begin_episode:
                     # 单集种子：记录开始集
                     if meta_info.end_episode:
                         # 如果有结束集，记录范围内的所有集
-                        for episode in range(meta_info.begin_episode, meta_info.end_episode + 1):
-                            downloaded_episodes[subscribe_id].add(episode)
+                        downloaded_episodes.update((torrent_season, episode) for episode in
+                                                   range(meta_info.begin_episode, meta_info.end_episode + 1))
                     else:
                         # 只有开始集
-                        downloaded_episodes[subscribe_id].add(meta_info.begin_episode)
-                elif meta_info.season:
+                        downloaded_episodes.add((torrent_season, meta_info.begin_episode))
+                else:
                     # 整季种子：episode_list为空代表整季都包含
-                    downloaded_episodes[subscribe_id].add(f"s{meta_info.season}")
+                    downloaded_seasons.add(torrent_season)
 
         except Exception as e:
-            logger.error(f"记录已下载集数失败: {str(e)}")
+            logger.error("记录已下载集数失败: %s", e)
+        return DownloadedCache(frozenset(downloaded_episodes), frozenset(downloaded_seasons))
 
     def _filter_no_exists_by_downloaded_torrents(self, subscribe: Subscribe, media_info: MediaInfo,
                                                  valid_downloaded_torrents: List[Context]) -> Dict:
@@ -1104,10 +1553,10 @@ class SubscriptionMultiVersion(_PluginBase):
 
             # 检查是否有已下载的集数（字典为空或所有季的集数集合都为空）
             if not downloaded_episodes or all(not episodes for episodes in downloaded_episodes.values()):
-                logger.info(f"订阅 {subscribe.name} 没有已下载的集数，返回原始缺失信息")
+                logger.info("订阅 %s 没有已下载的集数，返回原始缺失信息", subscribe.name)
                 return no_exists
 
-            logger.info(f"订阅 {subscribe.name} 已下载集数：{downloaded_episodes}")
+            logger.info("订阅 %s 已下载集数：%s", subscribe.name, downloaded_episodes)
 
             # 调用 __get_subscribe_no_exits 方法来过滤缺失剧集
             # 这里我们模拟该方法的核心逻辑
@@ -1122,7 +1571,7 @@ class SubscriptionMultiVersion(_PluginBase):
             )
 
         except Exception as e:
-            logger.error(f"根据已下载种子过滤缺失剧集失败: {str(e)}")
+            logger.error("根据已下载种子过滤缺失剧集失败: %s", e)
             # 出错时返回原始缺失信息
             return {}
 
@@ -1139,63 +1588,58 @@ class SubscriptionMultiVersion(_PluginBase):
 
         try:
             for torrent in torrents:
-                meta_info = torrent.meta_info
-                if not meta_info:
+                # 已下载种子的meta_info在构建时已按标题或下载历史的季集生成，直接使用
+                torrent_meta = torrent.meta_info
+                if not torrent_meta:
                     continue
 
-                # 从种子标题中解析集数信息
-                torrent_meta = MetaInfo(meta_info.title or meta_info.org_string or "")
-
                 # 处理多季种子（如 S01-S05）
                 if hasattr(torrent_meta, 'season_list') and torrent_meta.season_list:
                     for season in torrent_meta.season_list:
-                        # 为每个季创建集数集合
-                        if season not in downloaded_episodes:
-                            downloaded_episodes[season] = set()
+                        # 获取或创建该季的集数集合
+                        season_episodes = downloaded_episodes.setdefault(season, set())
 
                         # 如果有具体的集数信息
                         if torrent_meta.episode_list:
-                            downloaded_episodes[season].update(torrent_meta.episode_list)
+                            season_episodes.update(torrent_meta.episode_list)
                         elif torrent_meta.begin_episode:
                             if torrent_meta.end_episode:
                                 # 范围内的集数
-                                for episode in range(torrent_meta.begin_episode, torrent_meta.end_episode + 1):
-                                    downloaded_episodes[season].add(episode)
+                                season_episodes.update(range(torrent_meta.begin_episode,
+                                                             torrent_meta.end_episode + 1))
                             else:
                                 # 单集
-                                downloaded_episodes[season].add(torrent_meta.begin_episode)
+                                season_episodes.add(torrent_meta.begin_episode)
                         else:
                             # 整季，使用特殊标记 -1
-                            downloaded_episodes[season].add(-1)
+                            season_episodes.add(-1)
 
                 # 处理单季种子
                 elif torrent_meta.season:
                     # 获取或创建该季的集数集合
-                    if torrent_meta.season not in downloaded_episodes:
-                        downloaded_episodes[torrent_meta.season] = set()
+                    season_episodes = downloaded_episodes.setdefault(torrent_meta.season, set())
 
                     # 如果是多集种子
                     if torrent_meta.episode_list:
-                        downloaded_episodes[torrent_meta.season].update(torrent_meta.episode_list)
+                        season_episodes.update(torrent_meta.episode_list)
 
                     # 如果是单集种子
                     elif torrent_meta.begin_episode:
                         if torrent_meta.end_episode:
                             # 如果有结束集，添加范围内的所有集
-                            for episode in range(torrent_meta.begin_episode, torrent_meta.end_episode + 1):
-                                downloaded_episodes[torrent_meta.season].add(episode)
+                            season_episodes.update(range(torrent_meta.begin_episode, torrent_meta.end_episode + 1))
                         else:
                             # 只有开始集
-                            downloaded_episodes[torrent_meta.season].add(torrent_meta.begin_episode)
+                            season_episodes.add(torrent_meta.begin_episode)
 
                     # 如果是整季种子（没有具体集数信息但有季信息）
-                    elif torrent_meta.season:
+                    else:
                         # 对于整季种子，使用特殊标记 -1 表示整季已下载
                         # 在外层逻辑中会根据总集数信息来处理
-                        downloaded_episodes[torrent_meta.season].add(-1)
+                        season_episodes.add(-1)
 
         except Exception as e:
-            logger.error(f"提取已下载集数失败: {str(e)}")
+            logger.error("提取已下载集数失败: %s", e)
 
         return downloaded_episodes
 
@@ -1243,7 +1687,7 @@ class SubscriptionMultiVersion(_PluginBase):
             # 处理整季已下载的情况（特殊标记 -1）
             if -1 in season_downloaded:
                 # 整季已下载，所有集数都已存在
-                logger.info(f"订阅 {subscribe_name} 整季已下载，清除所有缺失集数")
+                logger.info("订阅 %s 整季已下载，清除所有缺失集数", subscribe_name)
                 return {}
 
             # 移除特殊标记，只保留数字集数
@@ -1254,7 +1698,7 @@ class SubscriptionMultiVersion(_PluginBase):
 
             # 如果所有集都已被下载，返回空字典表示没有缺失集数
             if not episodes:
-                logger.info(f"订阅 {subscribe_name} 所有集数已下载完毕")
+                logger.info("订阅 %s 所有集数已下载完毕", subscribe_name)
                 return {}
 
             # 更新缺失剧集信息
@@ -1265,27 +1709,31 @@ class SubscriptionMultiVersion(_PluginBase):
                 start_episode=start
             )
 
-            logger.info(f"订阅 {subscribe_name} 过滤后缺失集数：{episodes}")
+            logger.info("订阅 %s 过滤后缺失集数：%s", subscribe_name, episodes)
             return no_exists
 
         except Exception as e:
-            logger.error(f"应用已下载集数过滤失败: {str(e)}")
+            logger.error("应用已下载集数过滤失败: %s", e)
             return no_exists
 
     def _filter_torrents_with_rules(self, torrents: List[Context], media_info: MediaInfo,
                                     rule_groups: List[str] = None, quality: str = None,
                                     resolution: str = None, effect: str = None, include: str = None,
                                     exclude: str = None, size: str = None,
-                                    downloaded_episodes: set = None, prioritize_downloaded: bool = True) -> List[
-        Context]:
+                                    downloaded: DownloadedCache = None,
+                                    prioritize_downloaded: bool = True) -> List[Context]:
         """
         使用规则过滤种子
+        :param downloaded: 已下载的(季, 集)和整季下载的季
         """
+        if not torrents:
+            return []
+
         try:
             filtered_torrents = []
 
-            if downloaded_episodes is None:
-                downloaded_episodes = set()
+            if downloaded is None:
+                downloaded = DownloadedCache()
 
             # 构建过滤参数
             filter_params = {
@@ -1296,88 +1744,90 @@ class SubscriptionMultiVersion(_PluginBase):
                 "exclude": exclude,
                 "size": size
             }
-
-            for torrent in torrents:
-                try:
-                    # 检查是否是已下载种子
-                    is_downloaded = (torrent.meta_info and torrent.meta_info.org_string and
-                                     torrent.meta_info.org_string.startswith("downloaded:"))
-
-                    # 如果是已下载种子，检查是否通过过滤
-                    if is_downloaded:
-                        if self._check_torrent_filter(torrent, filter_params):
-                            # 已下载种子通过过滤，保留
-                            filtered_torrents.append(torrent)
-                        continue
-
-                    # 如果不是已下载种子，检查是否完全被已下载种子覆盖
-                    if prioritize_downloaded and self._is_episode_covered_for_media(torrent, media_info,
-                                                                                    downloaded_episodes):
-                        # 该种子的所有集数都已经被下载，跳过
-                        continue
-
-                    # 应用基本过滤规则
-                    if not TorrentHelper.filter_torrent(torrent.torrent_info, filter_params):
-                        continue
-
-                    # 应用规则组过滤
-                    if rule_groups:
-                        filtered_by_rules = self._filter_module.filter_torrents(
-                            rule_groups,
-                            [torrent.torrent_info],
-                            media_info
-                        )
-                        if not filtered_by_rules:
-                            continue
-
-                    # 通过所有过滤，保留种子
+            basic_params = self._basic_filter_params(filter_params)
+            # 只有电视剧且存在已下载集数时才需要检查集数覆盖，循环外判断一次
+            check_covered = (prioritize_downloaded and media_info.type == MediaType.TV
+                             and bool(downloaded.episodes or downloaded.seasons))
+            # 没有任何过滤条件时无需逐个检查
+            if not basic_params and not check_covered and not rule_groups:
+                return [torrent for torrent in torrents if torrent.torrent_info]
+            # 需要规则组过滤的候选种子
+            candidates = []
+
+            # 没有种子信息的无法过滤，循环前统一剔除
+            for torrent in (t for t in torrents if t.torrent_info):
+                # 已下载种子由下载历史构建，没有大小等信息，不参与基础过滤，直接保留
+                if self._is_downloaded_torrent(torrent):
                     filtered_torrents.append(torrent)
+                    continue
+
+                # 如果不是已下载种子，检查是否完全被已下载种子覆盖
+                if check_covered and self._is_episode_covered_for_media(torrent, media_info, downloaded):
+                    # 该种子的所有集数都已经被下载，跳过
+                    continue
 
-                except Exception as e:
-                    logger.error(f"过滤种子时出错: {str(e)}")
+                # 应用基本过滤规则（未设置过滤参数时不调用过滤）
+                if not self._check_torrent_filter(torrent, basic_params):
                     continue
 
+                # 通过基础过滤，规则组过滤在循环后批量执行
+                filtered_torrents.append(torrent)
+                candidates.append(torrent)
+
+            # 应用规则组过滤：所有候选种子一次性调用过滤模块，已下载种子不参与
+            if rule_groups and candidates:
+                passed_ids = {id(torrent_info) for torrent_info in self._filter_module.filter_torrents(
+                    rule_groups,
+                    [torrent.torrent_info for torrent in candidates],
+                    media_info
+                ) or []}
+                rejected = {id(torrent) for torrent in candidates if id(torrent.torrent_info) not in passed_ids}
+                if rejected:
+                    filtered_torrents = [torrent for torrent in filtered_torrents if id(torrent) not in rejected]
+
             return filtered_torrents
 
         except Exception as e:
-            logger.error(f"过滤种子失败: {str(e)}")
+            logger.error("过滤种子失败: %s", e)
             return []
 
-    def _is_episode_covered_for_media(self, torrent: Context, media_info: MediaInfo, downloaded_episodes: set) -> bool:
+    def _is_episode_covered_for_media(self, torrent: Context, media_info: MediaInfo,
+                                      downloaded: DownloadedCache) -> bool:
         """
         检查种子是否完全被已下载集数覆盖
         只有当种子的所有集数都已经被下载时，才返回True进行过滤
+        :param downloaded: 已下载的(季, 集)和整季下载的季
         """
         try:
             torrent_info = torrent.torrent_info
             if not torrent_info or not media_info or media_info.type != MediaType.TV:
                 return False
 
-            # 从种子标题中解析集数信息
-            meta_info = MetaInfo(torrent_info.title)
+            # 使用搜索时已按订阅自定义识别词解析的识别信息，没有时才解析种子标题
+            meta_info = torrent.meta_info or _parse_meta(torrent_info.title or "")
 
-            # 如果是整季种子
-            if not meta_info.episode_list and meta_info.season:
-                # 检查是否该整季已经下载
-                season_key = f"s{meta_info.season}"
-                return season_key in downloaded_episodes
+            # 没有季信息的种子无法确定所属季，不视为已覆盖
+            season = meta_info.begin_season
+            if season is None:
+                return False
 
-            # 如果是多集种子
-            elif meta_info.episode_list:
-                # 检查是否所有集都已经被下载
-                for episode in meta_info.episode_list:
-                    if episode not in downloaded_episodes:
-                        return False
+            # 该季已整季下载，种子的所有集都已覆盖
+            if season in downloaded.seasons:
                 return True
 
+            # 如果是多集种子
+            if meta_info.episode_list:
+                # 检查是否该季的所有集都已经被下载
+                return downloaded.episodes.issuperset((season, episode) for episode in meta_info.episode_list)
+
             # 如果是单集种子
             elif meta_info.begin_episode:
-                return meta_info.begin_episode in downloaded_episodes
+                return (season, meta_info.begin_episode) in downloaded.episodes
 
             return False
 
         except Exception as e:
-            logger.error(f"检查集数覆盖失败: {str(e)}")
+            logger.error("检查集数覆盖失败: %s", e)
             return False
 
     @staticmethod